@@ -316,7 +316,7 @@ async def get_integrity_report():
         return {"last_run": None, "summary": {}, "details": []}
     
     try:
-        with open(report_file, "r") as f:
+        with open(report_file, "r", encoding="utf-8") as f:
             return json.load(f)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to read report: {e}")
@@ -1102,6 +1102,7 @@ class SchedulerConfigRequest(BaseModel):
     day_of_week: str = "mon"
     hour: int = 6
     minute: int = 0
+    alert_cooldown_hours: Optional[float] = None
 
 
 @router.get("/scheduler/status")
@@ -1119,6 +1120,7 @@ async def configure_scheduler(request: SchedulerConfigRequest):
             day_of_week=request.day_of_week,
             hour=request.hour,
             minute=request.minute,
+            alert_cooldown_hours=request.alert_cooldown_hours,
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -292,6 +292,7 @@ export interface SchedulerStatus {
     last_run: string | null
     last_status: 'success' | 'error' | null
     last_error: string | null
+    alert_cooldown_hours: number
     is_running: boolean
 }
 
@@ -300,6 +301,7 @@ export interface SchedulerConfigRequest {
     day_of_week: string
     hour: number
     minute: number
+    alert_cooldown_hours?: number
 }
 
 export const getSchedulerStatus = async (): Promise<SchedulerStatus> => {
@@ -7,15 +7,140 @@ specifically for meteorological data.
 
 import pandas as pd
 import numpy as np
-from functools import reduce
 from . import config
 from . import logger_config
 
 # Get a logger for this module
 logger = logger_config.get_logger(__name__)
 
+# Met sensor checks: (column_base, (min_val, max_val))
+MET_CHECKS = (
+    ("met_WindSpeedRot", config.MET_WINDSPEED_RANGE),
+    ("met_WinddirectionRot", config.MET_WINDDIRECTION_RANGE),
+    ("met_Pressure", config.MET_PRESSURE_RANGE),
+    ("met_TemperatureTen", config.MET_TEMPERATURE_RANGE),
+)
 
-def check_stuck_values(df, base_column, n_intervals=None, exclude_zero=False):
+# Version of the check semantics. Bump it whenever a change alters which issues
+# the scan reports, so cached validation results are recomputed.
+SCAN_VERSION = 1
+
+# Default number of constant intervals treated as stuck, when no override is given
+DEFAULT_STUCK_INTERVALS = config.MET_STUCK_INTERVALS
+
+# Statistics compared by the stuck value check; the first three are also range checked
+STUCK_STATS = ("mean", "min", "max", "stddev")
+RANGE_STATS = STUCK_STATS[:3]
+
+# Column names of each sensor, built once instead of formatted on every call
+SENSOR_STAT_COLS = {base: tuple(f"{base}_{stat}" for stat in STUCK_STATS) for base, _ in MET_CHECKS}
+SENSOR_RANGE_COLS = {base: cols[:len(RANGE_STATS)] for base, cols in SENSOR_STAT_COLS.items()}
+SENSOR_MEAN_COLS = {base: cols[0] for base, cols in SENSOR_STAT_COLS.items()}
+SENSOR_COLS = tuple(col for cols in SENSOR_STAT_COLS.values() for col in cols)
+
+# Maximum number of issues logged individually by check_met_integrity
+INTEGRITY_LOG_ISSUE_LIMIT = 50
+
+
+def _rle(arr):
+    """
+    Run-length encodes a 1-D array.
+
+    Returns:
+        tuple: (lengths, starts, values) of each run of equal consecutive elements.
+    """
+    n = len(arr)
+    if n == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp), arr[:0]
+
+    # Last index of every run, then lengths as differences between run ends
+    run_ends = np.append(np.flatnonzero(arr[1:] != arr[:-1]), n - 1)
+    lengths = np.diff(np.append(-1, run_ends))
+    starts = run_ends - lengths + 1
+    return lengths, starts, arr[starts]
+
+
+def _float_array(series):
+    """Returns a column as a float64 ndarray with missing values as NaN."""
+    return series.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _stuck_runs_mask(is_same_arr, n_intervals):
+    """
+    Flags the rows of every stuck sequence, given for each row whether it repeats
+    its predecessor (rows sorted by StationId and TimeStamp).
+    """
+    # No row repeats its predecessor, so there is no constant run to flag
+    if not is_same_arr.any():
+        return np.zeros(len(is_same_arr), dtype=bool)
+
+    # Find runs of at least (n-1) consecutive "is_same" flags.
+    # A run covering rows [start, end) implies T[start-1] == T[start] == ... == T[end-1],
+    # so the stuck sequence spans [start-1, end). Run lengths are found in a single
+    # pass, independent of n_intervals.
+    lengths, starts, run_values = _rle(is_same_arr)
+    run_starts = starts[run_values]
+    run_ends = run_starts + lengths[run_values]
+
+    keep = (run_ends - run_starts) >= max(n_intervals - 1, 1)
+    # For n_intervals == 1 only the repeated rows themselves are flagged
+    seq_starts = run_starts[keep] - (1 if n_intervals > 1 else 0)
+    seq_ends = run_ends[keep]
+
+    # Mark [seq_start, seq_end) ranges via a difference array (ranges never overlap)
+    marks = np.zeros(len(is_same_arr) + 1, dtype=np.int8)
+    marks[seq_starts] += 1
+    marks[seq_ends] -= 1
+    return np.cumsum(marks[:-1]) > 0
+
+
+def _scan_stuck_arrays(station_arr, time_arr, values, sensor_slices, n_intervals, mean_positions=None):
+    """
+    Runs the stuck value check for several sensors on plain ndarrays.
+
+    Args:
+        station_arr: StationId of each row.
+        time_arr: TimeStamp of each row.
+        values: 2-D float array holding the statistic columns of every sensor side by side.
+        sensor_slices: For each sensor, the slice of its columns in values.
+        n_intervals: Number of consecutive intervals to consider 'stuck'.
+        mean_positions: Optional position of each sensor's mean column in values
+            (or None); rows where that mean is 0 do not count as repeats (exclude_zero).
+
+    Returns:
+        np.ndarray: Boolean (rows, sensors) mask of stuck values, in row order.
+    """
+    n_rows = len(station_arr)
+    masks = np.zeros((n_rows, len(sensor_slices)), dtype=bool)
+    # A stuck sequence spans n_intervals rows, so shorter inputs cannot contain one
+    if n_rows < n_intervals:
+        return masks
+
+    # Sort to ensure temporal order (stable, like a StationId/TimeStamp sort_values)
+    order = np.lexsort((time_arr, station_arr))
+    sorted_stations = station_arr[order]
+    values = values[order]
+
+    # Compare every row with the previous one once, for all columns at a time
+    same_station = sorted_stations[1:] == sorted_stations[:-1]
+    same_values = values[1:] == values[:-1]
+
+    is_same_arr = np.zeros(n_rows, dtype=bool)
+    for k, cols in enumerate(sensor_slices):
+        # A row repeats when the station and all of the sensor's statistics are unchanged
+        np.logical_and(same_station, same_values[:, cols].all(axis=1), out=is_same_arr[1:])
+
+        # Exclude stuck zeros if requested
+        if mean_positions is not None and mean_positions[k] is not None:
+            # If current value is 0, it doesn't count as a "stuck" event
+            is_same_arr &= values[:, mean_positions[k]] != 0
+
+        masks[order, k] = _stuck_runs_mask(is_same_arr, n_intervals)
+
+    return masks
+
+
+def check_stuck_values(df, base_column, n_intervals=None, exclude_zero=False, col_set=None):
     """
     Detect stuck values where mean, min, max, and stddev remain exactly constant
     for n_intervals.
@@ -25,85 +150,144 @@ def check_stuck_values(df, base_column, n_intervals=None, exclude_zero=False):
         base_column: Base name of the sensor (e.g., 'met_WindSpeedRot').
         n_intervals: Number of consecutive intervals to consider 'stuck'.
         exclude_zero: If True, a stuck value of 0 is not treated as stuck.
+        col_set: Optional precomputed set of df's column names, to avoid
+            repeated lookups on the column Index.
 
     Returns:
         pd.Series: A boolean mask where True indicates a stuck value that should be Nullified.
     """
-    n_intervals = n_intervals or config.MET_STUCK_INTERVALS
-    stats = ["mean", "min", "max", "stddev"]
-    
+    n_intervals = n_intervals or DEFAULT_STUCK_INTERVALS
+    if col_set is None:
+        col_set = frozenset(df.columns)
+
     # Filter for existing columns only
-    cols = [f"{base_column}_{stat}" for stat in stats if f"{base_column}_{stat}" in df.columns]
+    stat_cols = SENSOR_STAT_COLS.get(base_column) or tuple(f"{base_column}_{stat}" for stat in STUCK_STATS)
+    cols = [col for col in stat_cols if col in col_set]
     
-    if not cols:
+    if not cols or len(df) < n_intervals:
         return pd.Series(False, index=df.index)
 
-    # Sort to ensure temporal order
-    df_sorted = df.sort_values(["StationId", "TimeStamp"])
+    mean_col = stat_cols[0]
+    mean_positions = [cols.index(mean_col)] if exclude_zero and mean_col in cols else None
 
-    # 1. Check if StationId preserved
-    same_station = df_sorted["StationId"] == df_sorted["StationId"].shift(1)
-
-    # 2. Check if all value columns are identical to previous row
-    # Use reduce to combine boolean series for all columns
-    all_vals_same = reduce(
-        lambda acc, col: acc & (df_sorted[col] == df_sorted[col].shift(1)),
-        cols,
-        pd.Series(True, index=df_sorted.index)
+    masks = _scan_stuck_arrays(
+        df["StationId"].to_numpy(),
+        df["TimeStamp"].to_numpy(),
+        np.column_stack([_float_array(df[col]) for col in cols]),
+        [slice(0, len(cols))],
+        n_intervals,
+        mean_positions=mean_positions,
     )
+    return pd.Series(masks[:, 0], index=df.index)
 
-    is_same = same_station & all_vals_same
 
-    # Exclude stuck zeros if requested
-    if exclude_zero:
-        mean_col = f"{base_column}_mean"
-        if mean_col in df_sorted.columns:
-            # If current value is 0, it doesn't count as a "stuck" event
-            is_same &= (df_sorted[mean_col] != 0)
-
-    # Find n_intervals consecutive "is_same" flags.
-    # We verify that a run of (n-1) 'is_same' flags exists ending at 'i'.
-    # This implies T[i] == T[i-1] == ... == T[i-(n-1)]
-    stuck_at_end = is_same.copy()
-    # Convert to float for safe shifting (avoids object-dtype warning on fillna)
-    is_same_float = is_same.astype(float)
-    
-    for k in range(1, n_intervals - 1):
-        stuck_at_end &= is_same_float.shift(k).fillna(0.0).astype(bool)
+def _scan_station_completeness(station_df, station_id, period_start, period_end, present_sensor_cols, expected_index=None):
+    """
+    Runs the completeness, empty row and sensor gap checks for a single station.
 
-    # Backfill the True status to cover the entire stuck sequence
-    stuck_mask_sorted = stuck_at_end.copy()
-    stuck_at_end_float = stuck_at_end.astype(float)
-    
-    for k in range(1, n_intervals):
-        # Propagate "stuck detected" backwards k steps
-        stuck_mask_sorted |= stuck_at_end_float.shift(-k).fillna(0.0).astype(bool)
+    Only depends on the station's own rows, so it can be run independently for
+    each partition of a frame split by StationId.
+    Returns a list of issues found.
+    """
+    issues = []
 
-    # Realign with original index
-    return stuck_mask_sorted.reindex(df.index, fill_value=False)
+    # 2. Per-Station Completeness (reuse existing check_completeness)
+    comp_result = check_completeness(station_df, period_start, period_end, expected_index=expected_index)
+
+    if comp_result['completeness_percentage'] < 100.0:
+        # Truncate missing timestamps for report
+        missing_ts_list = comp_result['missing_timestamps']
+        truncated_missing = [ts.isoformat() for ts in missing_ts_list[:10]]
+        if len(missing_ts_list) > 10:
+            truncated_missing.append(f"... and {len(missing_ts_list) - 10} more")
+
+        issues.append({
+            "type": "completeness",
+            "station_id": int(station_id),
+            "count": comp_result['missing_count'],
+            "total_expected": comp_result['total_expected'],
+            "completeness_pct": comp_result['completeness_percentage'],
+            "missing_timestamps": truncated_missing,
+            "range_start": period_start.isoformat(),
+            "range_end": period_end.isoformat()
+        })
+
+    # 3. Per-Station Empty Rows (Present but all sensors NaN)
+    if present_sensor_cols:
+        # Check if ALL checks' mean columns are NaN for a row
+        empty_mask = station_df[present_sensor_cols].isna().all(axis=1)
+
+        if empty_mask.any():
+            empty_rows = station_df[empty_mask]
+            issues.append({
+                "type": "empty_row",
+                "station_id": int(station_id),
+                "sensor": "ALL",
+                "count": len(empty_rows),
+                "range_start": empty_rows['TimeStamp'].min().isoformat() if not empty_rows.empty else None,
+                "range_end": empty_rows['TimeStamp'].max().isoformat() if not empty_rows.empty else None,
+                "indices": empty_rows.index.tolist()
+            })
+
+        # 4. Per-Station Sensor Gaps (Row present, specific sensor NaN, not all NaN)
+        # We reuse empty_mask to strictly distinguish from "Empty Row"
+        non_empty_rows = station_df[~empty_mask]
+
+        if not non_empty_rows.empty:
+            for col in present_sensor_cols:
+                sensor_name = col.replace("_mean", "")
+                # Check where this specific sensor is NaN in otherwise valid rows
+                gap_mask = non_empty_rows[col].isna()
+
+                if gap_mask.any():
+                    gap_rows = non_empty_rows[gap_mask]
+                    issues.append({
+                        "type": "sensor_gap",
+                        "station_id": int(station_id),
+                        "sensor": sensor_name,
+                        "count": len(gap_rows),
+                        "range_start": gap_rows['TimeStamp'].min().isoformat(),
+                        "range_end": gap_rows['TimeStamp'].max().isoformat(),
+                        "indices": gap_rows.index.tolist()
+                    })
+
+    return issues
 
 
-def scan_met_integrity(df, period_start=None, period_end=None, stuck_intervals=None, exclude_zero=False):
+def scan_met_integrity(df, period_start=None, period_end=None, stuck_intervals=None, exclude_zero=False,
+                       expected_index=None):
     """
     Scans the dataframe for range and stuck checks on met data.
     Also checks for completeness per station if period_start and period_end are provided.
+    An optional precomputed expected_index (10min timestamps from period_start to
+    period_end) can be passed to skip rebuilding it.
     Returns a list of issues found.
     """
     if df.empty:
         return []
 
     issues = []
-    
+
+    # Column lookups on the Index are linear; check membership against a set instead
+    col_set = frozenset(df.columns)
+    station_ids = df['StationId'].to_numpy() if 'StationId' in col_set else None
+
     # --- Completeness Check ---
-    if period_start and period_end and 'StationId' in df.columns:
+    if period_start and period_end and station_ids is not None:
         if isinstance(period_start, str):
             period_start = pd.to_datetime(period_start)
         if isinstance(period_end, str):
             period_end = pd.to_datetime(period_end)
 
+        # The expected timestamps are identical for every completeness check below
+        if expected_index is not None:
+            full_range = expected_index
+        else:
+            full_range = pd.date_range(start=period_start, end=period_end, freq="10min")
+
         # 0. Global System Connectivity (Row Existence)
         # Checks if any row exists for a timestamp, regardless of sensor data
-        global_comp = check_completeness(df, period_start, period_end)
+        global_comp = check_completeness(df, period_start, period_end, expected_index=full_range)
         global_missing_set = set(global_comp['missing_timestamps'])
         
         if global_comp['completeness_percentage'] < 100.0:
@@ -124,28 +308,18 @@ def scan_met_integrity(df, period_start=None, period_end=None, stuck_intervals=N
                 "range_end": period_end.isoformat()
              })
 
-    # Define checks: (column_base, (min_val, max_val))
-    checks = [
-        ("met_WindSpeedRot", config.MET_WINDSPEED_RANGE),
-        ("met_WinddirectionRot", config.MET_WINDDIRECTION_RANGE),
-        ("met_Pressure", config.MET_PRESSURE_RANGE),
-        ("met_TemperatureTen", config.MET_TEMPERATURE_RANGE),
-    ]
-
-    # --- Completeness Check Continued (Sensor & Station specific) ---
-    if period_start and period_end and 'StationId' in df.columns:
         # 1. System-wide Completeness per Sensor (Union of all stations)
         # Checks if *at least one* station has data for each sensor
         # EXCLUDING intervals already covered by Global Connectivity gaps
-        for (sensor, _) in checks:
-             col_mean = f"{sensor}_mean"
-             if col_mean not in df.columns:
+        for (sensor, _) in MET_CHECKS:
+             col_mean = SENSOR_MEAN_COLS[sensor]
+             if col_mean not in col_set:
                  continue
                  
              # Filter to valid rows for this sensor
              valid_sensor_df = df[df[col_mean].notna()]
              
-             system_comp = check_completeness(valid_sensor_df, period_start, period_end)
+             system_comp = check_completeness(valid_sensor_df, period_start, period_end, expected_index=full_range)
              sensor_missing_set = set(system_comp['missing_timestamps'])
              
              # Deduplicate: Remove timestamps that are already globally missing
@@ -179,105 +353,78 @@ def scan_met_integrity(df, period_start=None, period_end=None, stuck_intervals=N
                  })
 
         # 2. Per-Station Completeness
-        for station_id in df['StationId'].unique():
-            station_df = df[df['StationId'] == station_id]
-            
-            # Reuse existing check_completeness
-            comp_result = check_completeness(station_df, period_start, period_end)
-            
-            if comp_result['completeness_percentage'] < 100.0:
-                 # Truncate missing timestamps for report
-                 missing_ts_list = comp_result['missing_timestamps']
-                 truncated_missing = [ts.isoformat() for ts in missing_ts_list[:10]]
-                 if len(missing_ts_list) > 10:
-                     truncated_missing.append(f"... and {len(missing_ts_list) - 10} more")
-
-                 issues.append({
-                    "type": "completeness",
-                    "station_id": int(station_id),
-                    "count": comp_result['missing_count'],
-                    "total_expected": comp_result['total_expected'],
-                    "completeness_pct": comp_result['completeness_percentage'],
-                    "missing_timestamps": truncated_missing,
-                    "range_start": period_start.isoformat(),
-                    "range_end": period_end.isoformat()
-                 })
-
-            # 3. Per-Station Empty Rows (Present but all sensors NaN)
-            # Identify columns to check (mean value of each sensor)
-            present_sensor_cols = [f"{s}_mean" for s, _ in checks if f"{s}_mean" in df.columns]
-            
-            if present_sensor_cols:
-                # Check if ALL checks' mean columns are NaN for a row
-                empty_mask = station_df[present_sensor_cols].isna().all(axis=1)
-                
-                if empty_mask.any():
-                     empty_rows = station_df[empty_mask]
-                     issues.append({
-                        "type": "empty_row",
-                        "station_id": int(station_id),
-                        "sensor": "ALL",
-                        "count": len(empty_rows),
-                        "range_start": empty_rows['TimeStamp'].min().isoformat() if not empty_rows.empty else None,
-                        "range_end": empty_rows['TimeStamp'].max().isoformat() if not empty_rows.empty else None,
-                        "indices": empty_rows.index.tolist()
-                     })
-
-                # 4. Per-Station Sensor Gaps (Row present, specific sensor NaN, not all NaN)
-                # We reuse empty_mask to strictly distinguish from "Empty Row"
-                non_empty_rows = station_df[~empty_mask]
-                
-                if not non_empty_rows.empty:
-                    for col in present_sensor_cols:
-                        sensor_name = col.replace("_mean", "")
-                        # Check where this specific sensor is NaN in otherwise valid rows
-                        gap_mask = non_empty_rows[col].isna()
-                        
-                        if gap_mask.any():
-                            gap_rows = non_empty_rows[gap_mask]
-                            issues.append({
-                                "type": "sensor_gap",
-                                "station_id": int(station_id),
-                                "sensor": sensor_name,
-                                "count": len(gap_rows),
-                                "range_start": gap_rows['TimeStamp'].min().isoformat(),
-                                "range_end": gap_rows['TimeStamp'].max().isoformat(),
-                                "indices": gap_rows.index.tolist()
-                            })
-
-    stats_to_check = ["mean", "min", "max"]
-
-    for base_col, (v_min, v_max) in checks:
-        # --- Stuck Value Checks ---
-        stuck_mask = check_stuck_values(df, base_col, n_intervals=stuck_intervals, exclude_zero=exclude_zero)
+        # Identify columns to check (mean value of each sensor)
+        present_sensor_cols = [col for col in SENSOR_MEAN_COLS.values() if col in col_set]
+
+        for station_id in pd.unique(station_ids):
+            issues.extend(_scan_station_completeness(
+                df[station_ids == station_id], station_id, period_start, period_end, present_sensor_cols,
+                expected_index=full_range
+            ))
+
+    # Extract every met column once; all checks below work on these arrays
+    arrs = {c: _float_array(df[c]) for c in SENSOR_COLS if c in col_set}
+    n_intervals = stuck_intervals or DEFAULT_STUCK_INTERVALS
+
+    # --- Stuck Value Checks ---
+    # Lay out the statistics of every sensor side by side and scan them in one call
+    stuck_cols = []
+    sensor_slices = []
+    mean_positions = []
+    stuck_sensor_pos = {}
+    for base_col, _ in MET_CHECKS:
+        cols = [col for col in SENSOR_STAT_COLS[base_col] if col in arrs]
+        if not cols:
+            continue
+        mean_col = SENSOR_MEAN_COLS[base_col]
+        mean_positions.append(len(stuck_cols) + cols.index(mean_col) if exclude_zero and mean_col in cols else None)
+        stuck_sensor_pos[base_col] = len(sensor_slices)
+        sensor_slices.append(slice(len(stuck_cols), len(stuck_cols) + len(cols)))
+        stuck_cols.extend(cols)
+
+    stuck_masks = None
+    if stuck_cols and station_ids is not None:
+        stuck_masks = _scan_stuck_arrays(
+            station_ids,
+            df["TimeStamp"].to_numpy(),
+            np.column_stack([arrs[c] for c in stuck_cols]),
+            sensor_slices,
+            n_intervals,
+            mean_positions=mean_positions,
+        )
+
+    for base_col, (v_min, v_max) in MET_CHECKS:
+        if stuck_masks is not None and base_col in stuck_sensor_pos:
+            stuck_mask = stuck_masks[:, stuck_sensor_pos[base_col]]
+        else:
+            stuck_mask = np.zeros(len(df), dtype=bool)
 
         if stuck_mask.any():
             stuck_rows = df[stuck_mask]
             
-            # Record issue
-            # Let's iterate over unique stations in stuck_rows to be more accurate in the report
-            for station_id in stuck_rows['StationId'].unique():
-                 station_stuck = stuck_rows[stuck_rows['StationId'] == station_id]
-                 issues.append({
+            # Record one issue per station, splitting the stuck rows in a single groupby pass
+            for station_id, station_stuck in stuck_rows.groupby('StationId', sort=False):
+                issues.append({
                     "type": "stuck_value",
                     "station_id": int(station_id),
                     "sensor": base_col,
                     "count": len(station_stuck),
                     "range_start": station_stuck['TimeStamp'].min(),
                     "range_end": station_stuck['TimeStamp'].max(),
-                    "sample_value": station_stuck.iloc[0].get(f'{base_col}_mean', 'N/A'),
+                    "sample_value": station_stuck.iloc[0].get(SENSOR_MEAN_COLS[base_col], 'N/A'),
                     "indices": station_stuck.index.tolist()
-                 })
+                })
 
         # --- Range Checks ---
-        for stat in stats_to_check:
-            col = f"{base_col}_{stat}"
-            if col not in df.columns:
+        for col in SENSOR_RANGE_COLS[base_col]:
+            if col not in arrs:
                 continue
 
-            # Identify values outside [v_min, v_max]
-            illogical_mask = df[col].between(v_min, v_max, inclusive="both")
-            is_outlier = (df[col].notna()) & (~illogical_mask)
+            # Identify values outside [v_min, v_max] in one pass: clipping only
+            # changes out-of-range values, and the self-compare drops NaNs
+            arr = arrs[col]
+            is_outlier = arr != np.clip(arr, v_min, v_max)
+            is_outlier &= arr == arr
 
             if is_outlier.any():
                 outlier_rows = df[is_outlier]
@@ -299,55 +446,105 @@ def scan_met_integrity(df, period_start=None, period_end=None, stuck_intervals=N
     return issues
 
 
-def check_met_integrity(df):
+def group_issues_by_type(issues):
+    """
+    Groups a list of issues (as returned by scan_met_integrity) by their type.
+
+    Returns:
+        dict: issue type -> list of issues of that type, in their original order.
+    """
+    grouped = {}
+    for issue in issues:
+        grouped.setdefault(issue["type"], []).append(issue)
+    return grouped
+
+
+def check_met_integrity(df, inplace=False):
     """
     Performs range and stuck checks on met data.
     Modified values are logged and replaced with NaN.
+
+    If inplace is False, the input is left untouched: the result is a shallow
+    copy in which only the columns that get nullified are duplicated.
     """
     if df.empty:
         return df
 
-    df_clean = df.copy()
     issues = scan_met_integrity(df)
-    
+
+    if inplace:
+        df_clean = df
+    else:
+        # Only copy the columns that will actually be written to
+        mutated_cols = set()
+        for issue in issues:
+            if issue["type"] == "stuck_value":
+                mutated_cols.update(SENSOR_STAT_COLS[issue['sensor']])
+            elif issue["type"] == "out_of_range":
+                mutated_cols.add(issue["column"])
+
+        df_clean = df.copy(deep=False)
+        for col in mutated_cols:
+            if col in df_clean.columns:
+                df_clean[col] = df[col].to_numpy(copy=True)
+
+    # Above this many issues, per-issue lines drop to DEBUG and a single summary is logged
+    log_each = len(issues) <= INTEGRITY_LOG_ISSUE_LIMIT
+    log_issue = logger.warning if log_each else logger.debug
+    stuck_count = 0
+    illogical_count = 0
+
     for issue in issues:
         # Log summary (Replicating original logging format roughly)
         if issue["type"] == "stuck_value":
-            logger.warning(
-                f"[INTEGRITY] STUCK VALUES: Station {issue['station_id']} | Sensor: {issue['sensor']} | "
-                f"Count: {issue['count']} | "
-                f"Range: {issue['range_start']} to {issue['range_end']} | "
-                f"Sample: {issue['sample_value']} | Action: Nullify"
+            stuck_count += 1
+            log_issue(
+                "[INTEGRITY] STUCK VALUES: Station %s | Sensor: %s | Count: %d | "
+                "Range: %s to %s | Sample: %s | Action: Nullify",
+                issue['station_id'], issue['sensor'], issue['count'],
+                issue['range_start'], issue['range_end'], issue['sample_value']
             )
-            
+
             # Nullify all related stat columns
-            base_col = issue['sensor']
-            for stat in ["mean", "min", "max", "stddev"]:
-                col = f"{base_col}_{stat}"
+            for col in SENSOR_STAT_COLS[issue['sensor']]:
                 if col in df_clean.columns:
                     df_clean.loc[issue['indices'], col] = np.nan
-                    
+
         elif issue["type"] == "out_of_range":
-             logger.warning(
-                f"[INTEGRITY] ILLOGICAL VALUES: Station {issue['station_id']} | Column: {issue['column']} | "
-                f"Count: {issue['count']} | "
-                f"Range: {issue['range_start']} to {issue['range_end']} | "
-                f"Bounds: [{issue['bounds'][0]}, {issue['bounds'][1]}] | Action: Nullify"
+            illogical_count += 1
+            log_issue(
+                "[INTEGRITY] ILLOGICAL VALUES: Station %s | Column: %s | Count: %d | "
+                "Range: %s to %s | Bounds: [%s, %s] | Action: Nullify",
+                issue['station_id'], issue['column'], issue['count'],
+                issue['range_start'], issue['range_end'], issue['bounds'][0], issue['bounds'][1]
             )
-             df_clean.loc[issue['indices'], issue['column']] = np.nan
+            df_clean.loc[issue['indices'], issue['column']] = np.nan
+
+    if not log_each:
+        logger.warning(
+            "[INTEGRITY] %d stuck value issues and %d illogical value issues found | Action: Nullify",
+            stuck_count, illogical_count
+        )
 
     return df_clean
 
 
-def check_completeness(df, start_time, end_time, frequency="10min"):
+def check_completeness(df, start_time, end_time, frequency="10min", expected_index=None):
     """
     Check for missing timestamps in the dataframe within the specified range.
-    
+
+    Args:
+        expected_index: Optional precomputed DatetimeIndex of the expected timestamps
+            for (start_time, end_time, frequency), reused across repeated calls.
+
     Returns:
         dict: Summary of missing values (count, missing_timestamps).
     """
     # Create the full expected range
-    full_range = pd.date_range(start=start_time, end=end_time, freq=frequency)
+    if expected_index is not None:
+        full_range = expected_index
+    else:
+        full_range = pd.date_range(start=start_time, end=end_time, freq=frequency)
     total_expected = len(full_range)
 
     if df.empty:
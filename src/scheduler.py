@@ -3,31 +3,51 @@ Scheduler Module for Wind Farm Data Processing
 
 Provides background job scheduling using APScheduler.
 Runs weekly processing jobs and sends failure alerts.
-Jobs run in a separate process to allow clean shutdown.
+Jobs run in a long-lived worker process to allow clean shutdown.
+
+The worker imports src.config (and so reads .env) once, when it starts, and
+keeps it for every later run. After changing credentials or paths in .env,
+disable and re-enable the scheduler (or restart the server) so a new worker
+picks them up.
 """
 
 import json
 import os
-import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
+from functools import lru_cache, partial
+from types import SimpleNamespace
 from typing import Optional, Dict, Any, List
 from pathlib import Path
 
+import pandas as pd
+
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
-from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_EXECUTED, JobExecutionEvent
 
 from src import logger_config
 from src import config
 
 logger = logger_config.get_logger(__name__)
 
-# Track the running job process for clean shutdown
-_job_process: Optional[multiprocessing.Process] = None
+# Long-lived worker process pool and the currently running job, for clean shutdown
+_executor: Optional[ProcessPoolExecutor] = None
+_current_future: Optional[Future] = None
+
+# Thread running a manually triggered job when the scheduler is not running
+_job_thread: Optional[threading.Thread] = None
+
+# Serializes job launches so two triggers cannot both start a job
+_launch_lock = threading.Lock()
 
 # Config file path for persisting scheduler settings
 SCHEDULER_CONFIG_FILE = Path(__file__).parent.parent / "config" / "scheduler_config.json"
 
+# Failure alerts within this many hours of the previous one are suppressed
+DEFAULT_ALERT_COOLDOWN_HOURS = 6
+
 # Global scheduler instance
 _scheduler: Optional[BackgroundScheduler] = None
 _scheduler_config: Dict[str, Any] = {
@@ -38,41 +58,107 @@ _scheduler_config: Dict[str, Any] = {
     "last_run": None,
     "last_status": None,
     "last_error": None,
+    "last_alert_time": None,
+    "alert_cooldown_hours": DEFAULT_ALERT_COOLDOWN_HOURS,
 }
 
+# mtime of the config file when it was last loaded (-1 forces a reload)
+_config_mtime_ns: int = -1
 
-def _load_config() -> Dict[str, Any]:
-    """Load scheduler configuration from file."""
-    global _scheduler_config
+
+def _read_config() -> Dict[str, Any]:
+    """Read the saved scheduler configuration from file (empty dict if unavailable)."""
     if SCHEDULER_CONFIG_FILE.exists():
         try:
             with open(SCHEDULER_CONFIG_FILE, "r") as f:
-                saved = json.load(f)
-                _scheduler_config.update(saved)
+                return json.load(f)
         except Exception as e:
             logger.error(f"[SCHEDULER] Failed to load scheduler config: {e}")
-    return _scheduler_config
+    return {}
 
 
-def _save_config() -> None:
-    """Save scheduler configuration to file."""
+def _write_config(cfg: Dict[str, Any]) -> None:
+    """
+    Write the given scheduler configuration to file.
+    Writes to a temporary file and renames it over the config, so an
+    interrupted write never leaves a truncated file behind.
+    """
+    tmp_file = SCHEDULER_CONFIG_FILE.with_suffix(SCHEDULER_CONFIG_FILE.suffix + ".tmp")
     try:
         SCHEDULER_CONFIG_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with open(SCHEDULER_CONFIG_FILE, "w") as f:
-            json.dump(_scheduler_config, f, indent=2, default=str)
+        with open(tmp_file, "w") as f:
+            json.dump(cfg, f, indent=2, default=str)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, SCHEDULER_CONFIG_FILE)
     except Exception as e:
         logger.error(f"[SCHEDULER] Failed to save scheduler config: {e}")
 
 
+def _load_config() -> Dict[str, Any]:
+    """
+    Load scheduler configuration from file into the scheduler's config.
+    The file is only re-read when its mtime changed since the last load.
+    """
+    global _config_mtime_ns
+    try:
+        mtime = SCHEDULER_CONFIG_FILE.stat().st_mtime_ns
+    except OSError:
+        return _scheduler_config
+    if mtime != _config_mtime_ns:
+        try:
+            with open(SCHEDULER_CONFIG_FILE, "r") as f:
+                saved = json.load(f)
+        except Exception as e:
+            # Keep the old mtime so a transient failure is retried on the next call
+            logger.error(f"[SCHEDULER] Failed to load scheduler config: {e}")
+            return _scheduler_config
+        _scheduler_config.update(saved)
+        _config_mtime_ns = mtime
+    return _scheduler_config
+
+
+def _save_config() -> None:
+    """Save the scheduler's configuration to file."""
+    _write_config(_scheduler_config)
+
+
+def _record_run_status(job_time: datetime, status: str, error: Optional[str] = None) -> None:
+    """
+    Persist the outcome of a processing run in a single read-update-write.
+    Works on a local copy of the file rather than _scheduler_config, which
+    belongs to the scheduler in the parent process.
+    """
+    cfg = _read_config()
+    cfg["last_run"] = job_time.isoformat()
+    cfg["last_status"] = status
+    cfg["last_error"] = error
+    _write_config(cfg)
+
+
 def _send_failure_alert(error_message: str, job_time: datetime) -> None:
-    """Send email alert when scheduled job fails."""
+    """
+    Send email alert when scheduled job fails.
+    Alerts are suppressed within the configured cooldown of the last one sent.
+    """
+    cfg = _read_config()
+    now = datetime.now()
+    cooldown = timedelta(hours=cfg.get("alert_cooldown_hours", DEFAULT_ALERT_COOLDOWN_HOURS))
+    last_alert = cfg.get("last_alert_time")
+    if last_alert:
+        try:
+            if now - datetime.fromisoformat(last_alert) < cooldown:
+                logger.info(f"[SCHEDULER] Failure alert suppressed by cooldown (last sent {last_alert})")
+                return
+        except ValueError:
+            logger.warning(f"[SCHEDULER] Invalid last_alert_time in config: {last_alert}")
+
     try:
         from src import email_send
         
         subject = f"⚠️ AutoAvailability Scheduled Processing Failed - {job_time.strftime('%Y-%m-%d %H:%M')}"
         
         # Create a simple DataFrame for the email
-        import pandas as pd
         error_df = pd.DataFrame({
             "Field": ["Scheduled Time", "Error", "Server Time"],
             "Value": [
@@ -90,20 +176,111 @@ def _send_failure_alert(error_message: str, job_time: datetime) -> None:
         logger.info("[SCHEDULER] Failure alert email sent successfully")
     except Exception as e:
         logger.error(f"[SCHEDULER] Failed to send failure alert email: {e}")
+        return
 
+    # Sending can take a while: re-read so settings saved meanwhile are kept
+    cfg = _read_config()
+    cfg["last_alert_time"] = now.isoformat()
+    _write_config(cfg)
 
-def _processing_worker() -> None:
+
+@lru_cache(maxsize=None)
+def _processing_modules() -> SimpleNamespace:
     """
-    Worker function that runs in a separate process.
-    Processes yesterday's data with all standard steps.
+    Import the heavy processing modules once per process and return them.
+    Kept out of module scope so the scheduler can be imported without them.
     """
-    import pandas as pd
     from src import data_exporter
     from src import calculation
     from src import hebdo_calc
     from src import email_send
     from src import validation_runner
     from src import results_grouper
+
+    return SimpleNamespace(
+        data_exporter=data_exporter,
+        calculation=calculation,
+        hebdo_calc=hebdo_calc,
+        email_send=email_send,
+        validation_runner=validation_runner,
+        results_grouper=results_grouper,
+    )
+
+
+def _preimport() -> None:
+    """
+    Worker process initializer.
+    Imports the heavy processing modules once, so each run starts warm.
+    """
+    # A failing initializer breaks the whole pool, so only log here and let
+    # the job itself report the import error when it runs
+    try:
+        _processing_modules()
+    except Exception as e:
+        logger.error(f"[SCHEDULER] Failed to pre-import processing modules: {e}")
+
+
+def _warm_up() -> None:
+    """No-op task submitted to a new pool to spawn its worker process."""
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """
+    Return the worker pool, creating it on first use.
+    ProcessPoolExecutor only spawns its worker on the first submit, so a no-op
+    task is submitted right away to start the process and run _preimport.
+    The worker keeps the configuration it loaded at start-up until the pool is
+    shut down by stop_scheduler or replaced after the worker dies.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=1, initializer=_preimport)
+        _executor.submit(_warm_up)
+    return _executor
+
+
+def _worker_processes(executor: ProcessPoolExecutor) -> list:
+    """
+    Return the pool's worker processes.
+    ProcessPoolExecutor has no public API to reach its processes, so this reads
+    the private _processes attribute; keep every such access in this helper.
+    """
+    return list((getattr(executor, "_processes", None) or {}).values())
+
+
+def _shutdown_executor() -> None:
+    """Cancel pending jobs, terminate the worker process and drop the pool."""
+    global _executor, _current_future
+    if _executor is None:
+        return
+
+    # shutdown() does not interrupt a running job, so stop the worker process directly
+    for process in _worker_processes(_executor):
+        if process.is_alive():
+            logger.info(f"[SCHEDULER] Terminating worker process {process.pid}")
+            process.terminate()
+            process.join(timeout=2)
+            if process.is_alive():
+                process.kill()
+                process.join(timeout=1)
+
+    _executor.shutdown(wait=False, cancel_futures=True)
+    _executor = None
+    _current_future = None
+
+
+def _processing_worker() -> None:
+    """
+    Worker function that runs in a separate process.
+    Processes yesterday's data with all standard steps.
+    """
+    modules = _processing_modules()
+    data_exporter = modules.data_exporter
+    calculation = modules.calculation
+    hebdo_calc = modules.hebdo_calc
+    email_send = modules.email_send
+    validation_runner = modules.validation_runner
+    results_grouper = modules.results_grouper
     
     job_time = datetime.now()
     target_date = datetime.now() - timedelta(days=1)
@@ -116,15 +293,15 @@ def _processing_worker() -> None:
         period_start_dt = target_date.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=6)
         period_end_dt = target_date.replace(hour=23, minute=50, second=0, microsecond=0)
         period_range = pd.period_range(start=period_start_dt, end=period_end_dt, freq="M")
+        # 'YYYY-MM' strings shared by all steps, deduplicated in order
+        period_months = list(dict.fromkeys(p.strftime("%Y-%m") for p in period_range))
         
-        for period in period_range:
-            period_str = period.strftime("%Y-%m")
+        for period_str in period_months:
             logger.info(f"[SCHEDULER] Exporting data for {period_str}")
             data_exporter.main_export_flow(period=period_str, update_mode="append")
         
         # Step 2: Calculations
-        for period in period_range:
-            period_month = period.strftime("%Y-%m")
+        for period_month in period_months:
             logger.info(f"[SCHEDULER] Running calculations for {period_month}")
             results = calculation.full_calculation(period_month)
             results.to_pickle(f"./monthly_data/results/{period_month}.pkl")
@@ -153,18 +330,12 @@ def _processing_worker() -> None:
         
         # Step 5: Validation
         logger.info("[SCHEDULER] Running data validation")
-        validation_periods = list(set([p.strftime("%Y-%m") for p in period_range]))
         validation_runner.run_validation_scan(
-            target_periods=validation_periods,
+            target_periods=period_months,
             override_end_date=date_str
         )
         
-        # Update status - reload config in case it changed
-        _load_config()
-        _scheduler_config["last_run"] = job_time.isoformat()
-        _scheduler_config["last_status"] = "success"
-        _scheduler_config["last_error"] = None
-        _save_config()
+        _record_run_status(job_time, "success")
         
         logger.info(f"[SCHEDULER] Weekly processing completed successfully for {date_str}")
         
@@ -172,41 +343,73 @@ def _processing_worker() -> None:
         error_msg = str(e)
         logger.exception(f"[SCHEDULER] Processing failed: {error_msg}")
         
-        # Update status
-        _load_config()
-        _scheduler_config["last_run"] = job_time.isoformat()
-        _scheduler_config["last_status"] = "error"
-        _scheduler_config["last_error"] = error_msg
-        _save_config()
+        _record_run_status(job_time, "error", error_msg)
         
         # Send failure alert
         _send_failure_alert(error_msg, job_time)
 
 
-def _run_scheduled_processing() -> None:
+def _on_job_done(future: Future, job_time: Optional[datetime] = None) -> None:
     """
-    Wrapper that launches the processing job in a separate process.
-    This allows the server to be shut down cleanly with Ctrl+C.
+    Log completion of a job submitted to the worker pool.
+    _processing_worker records its own failures, so an exception here means the
+    worker process itself died (killed, out of memory, native crash): record and
+    alert it from the parent instead.
     """
-    global _job_process
-    
-    # If a job is already running, skip
-    if _job_process is not None and _job_process.is_alive():
-        logger.warning("[SCHEDULER] Job already running, skipping this trigger")
-        return
-    
-    # Start the worker in a separate process
-    _job_process = multiprocessing.Process(target=_processing_worker)
-    _job_process.start()
-    logger.info(f"[SCHEDULER] Started job in process {_job_process.pid}")
+    if future.cancelled():
+        logger.info("[SCHEDULER] Job cancelled")
+    elif future.exception() is not None:
+        error_msg = f"Worker process failed: {future.exception()}"
+        logger.error(f"[SCHEDULER] {error_msg}")
+        job_time = job_time or datetime.now()
+        _record_run_status(job_time, "error", error_msg)
+        _send_failure_alert(error_msg, job_time)
+    else:
+        logger.info("[SCHEDULER] Job worker finished")
 
 
-def _on_job_event(event: JobExecutionEvent) -> None:
-    """Handle APScheduler job events for logging."""
-    if event.exception:
-        logger.error(f"[SCHEDULER] Job {event.job_id} failed with exception")
-    else:
-        logger.info(f"[SCHEDULER] Job {event.job_id} executed successfully")
+def _is_job_running() -> bool:
+    """Check whether a job is running, either in the worker process or in a thread."""
+    if _current_future is not None and not _current_future.done():
+        return True
+    return _job_thread is not None and _job_thread.is_alive()
+
+
+def _run_scheduled_processing(use_process: bool = True) -> None:
+    """
+    Wrapper that submits the processing job to the long-lived worker process.
+    This allows the server to be shut down cleanly with Ctrl+C.
+
+    Args:
+        use_process: If False, run the job in a daemon thread instead. Used for
+            manual triggers, which don't need the worker process to be started.
+    """
+    global _current_future, _job_thread
+
+    # Cron triggers (scheduler thread) and manual triggers (API) can race:
+    # make the running check and the launch a single step
+    with _launch_lock:
+        # If a job is already running, skip
+        if _is_job_running():
+            logger.warning("[SCHEDULER] Job already running, skipping this trigger")
+            return
+
+        if not use_process:
+            _job_thread = threading.Thread(target=_processing_worker, name="scheduler-job", daemon=True)
+            _job_thread.start()
+            logger.info("[SCHEDULER] Started job in background thread")
+            return
+
+        # Submit the worker to the pre-warmed process
+        try:
+            _current_future = _get_executor().submit(_processing_worker)
+        except BrokenProcessPool:
+            # The worker died since the last run: replace the pool and retry once
+            logger.warning("[SCHEDULER] Worker process pool is broken, starting a new one")
+            _shutdown_executor()
+            _current_future = _get_executor().submit(_processing_worker)
+        _current_future.add_done_callback(partial(_on_job_done, job_time=datetime.now()))
+        logger.info("[SCHEDULER] Submitted job to worker process")
 
 
 def get_scheduler_status() -> Dict[str, Any]:
@@ -232,6 +435,7 @@ def get_scheduler_status() -> Dict[str, Any]:
         "last_run": _scheduler_config.get("last_run"),
         "last_status": _scheduler_config.get("last_status"),
         "last_error": _scheduler_config.get("last_error"),
+        "alert_cooldown_hours": _scheduler_config.get("alert_cooldown_hours", DEFAULT_ALERT_COOLDOWN_HOURS),
         "is_running": _scheduler is not None and _scheduler.running,
     }
 
@@ -241,6 +445,7 @@ def configure_scheduler(
     day_of_week: str = "mon",
     hour: int = 6,
     minute: int = 0,
+    alert_cooldown_hours: Optional[float] = None,
 ) -> Dict[str, Any]:
     """
     Configure the scheduler with new settings.
@@ -250,6 +455,8 @@ def configure_scheduler(
         day_of_week: Day of week (mon, tue, wed, thu, fri, sat, sun)
         hour: Hour to run (0-23)
         minute: Minute to run (0-59)
+        alert_cooldown_hours: Minimum hours between failure alert emails
+            (unchanged if None)
     
     Returns:
         Updated scheduler status
@@ -264,12 +471,16 @@ def configure_scheduler(
         raise ValueError("Hour must be between 0 and 23")
     if not (0 <= minute <= 59):
         raise ValueError("Minute must be between 0 and 59")
+    if alert_cooldown_hours is not None and alert_cooldown_hours < 0:
+        raise ValueError("Alert cooldown must be zero or more hours")
     
     # Update config
     _scheduler_config["enabled"] = enabled
     _scheduler_config["day_of_week"] = day_of_week.lower()
     _scheduler_config["hour"] = hour
     _scheduler_config["minute"] = minute
+    if alert_cooldown_hours is not None:
+        _scheduler_config["alert_cooldown_hours"] = alert_cooldown_hours
     _save_config()
     
     # Apply changes to scheduler
@@ -291,9 +502,11 @@ def start_scheduler() -> None:
     if _scheduler and _scheduler.running:
         _scheduler.shutdown(wait=False)
     
+    # Spawn the worker process now so imports are warm before the first trigger
+    _get_executor()
+
     # Create new scheduler
     _scheduler = BackgroundScheduler(timezone="Europe/Paris")
-    _scheduler.add_listener(_on_job_event, EVENT_JOB_EXECUTED | EVENT_JOB_ERROR)
     
     # Add the weekly job
     trigger = CronTrigger(
@@ -316,17 +529,17 @@ def start_scheduler() -> None:
 
 def stop_scheduler() -> None:
     """Stop the scheduler and any running job process."""
-    global _scheduler, _job_process
+    global _scheduler
     
     # Terminate running job process if any
-    if _job_process is not None and _job_process.is_alive():
-        logger.info(f"[SCHEDULER] Terminating running job process {_job_process.pid}")
-        _job_process.terminate()
-        _job_process.join(timeout=2)
-        if _job_process.is_alive():
-            _job_process.kill()
-            _job_process.join(timeout=1)
-    _job_process = None
+    _shutdown_executor()
+
+    # A job thread cannot be killed, give it a moment to finish
+    if _job_thread is not None and _job_thread.is_alive():
+        logger.info("[SCHEDULER] Waiting for running job thread")
+        _job_thread.join(timeout=2)
+        if _job_thread.is_alive():
+            logger.warning("[SCHEDULER] Manually triggered job is still running and will continue in the background")
     
     # Shutdown scheduler
     if _scheduler and _scheduler.running:
@@ -352,10 +565,10 @@ def shutdown_scheduler() -> None:
 
 def trigger_now() -> Dict[str, str]:
     """Manually trigger the scheduled job immediately (for testing)."""
-    global _scheduler, _job_process
+    global _scheduler
     
     # Check if a job is already running
-    if _job_process is not None and _job_process.is_alive():
+    if _is_job_running():
         return {"status": "running", "message": "A job is already running"}
     
     if _scheduler and _scheduler.running:
@@ -364,7 +577,10 @@ def trigger_now() -> Dict[str, str]:
             _scheduler.modify_job("weekly_processing", next_run_time=datetime.now())
             return {"status": "triggered", "message": "Job will run shortly"}
     
-    # If scheduler not running, run directly via multiprocessing
-    _run_scheduled_processing()
+    # If scheduler not running, run directly in a background thread.
+    # Unlike scheduled runs, this one shares the API process's GIL and cannot be
+    # cancelled by stop_scheduler. That is acceptable for an occasional, explicit
+    # manual trigger, and avoids spawning the worker process while the scheduler is off.
+    _run_scheduled_processing(use_process=False)
     return {"status": "triggered", "message": "Job started in background"}
 
@@ -17,18 +17,30 @@ DEFAULT_SETTINGS: Dict[str, Any] = {
 
 _current_settings: Dict[str, Any] = DEFAULT_SETTINGS.copy()
 
+# mtime of the settings file when it was last parsed (-1 forces a reload)
+_settings_cache_mtime: int = -1
+
 def load_settings() -> Dict[str, Any]:
-    """Load application settings from file."""
-    global _current_settings
+    """Load application settings from file, only re-parsing it when it changed."""
+    global _current_settings, _settings_cache_mtime
     if SETTINGS_FILE.exists():
         try:
+            mtime = SETTINGS_FILE.stat().st_mtime_ns
+            if mtime == _settings_cache_mtime:
+                return _current_settings
             with open(SETTINGS_FILE, "r") as f:
                 saved = json.load(f)
                 _current_settings.update(saved)
+            _settings_cache_mtime = mtime
         except Exception as e:
             logger.error(f"[SETTINGS] Failed to load settings: {e}")
     return _current_settings
 
+def invalidate_cache() -> None:
+    """Force the next load_settings call to re-read the settings file."""
+    global _settings_cache_mtime
+    _settings_cache_mtime = -1
+
 def save_settings(new_settings: Dict[str, Any]) -> None:
     """Save application settings to file."""
     global _current_settings
@@ -40,6 +52,7 @@ def save_settings(new_settings: Dict[str, Any]) -> None:
         SETTINGS_FILE.parent.mkdir(parents=True, exist_ok=True)
         with open(SETTINGS_FILE, "w") as f:
             json.dump(_current_settings, f, indent=2)
+        invalidate_cache()
         logger.info("[SETTINGS] Configuration saved successfully")
     except Exception as e:
         logger.error(f"[SETTINGS] Failed to save settings: {e}")
@@ -47,8 +60,7 @@ def save_settings(new_settings: Dict[str, Any]) -> None:
 
 def get_setting(key: str, default: Any = None) -> Any:
     """Get a single setting value."""
-    _current_settings = load_settings()
-    return _current_settings.get(key, default)
+    return load_settings().get(key, default)
 
 # Load on module import
 load_settings()
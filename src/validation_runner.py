@@ -1,31 +1,255 @@
+import os
+import functools
+import numpy as np
 import pandas as pd
 import pathlib
 import json
+import multiprocessing
 import traceback
-from datetime import datetime, date
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from datetime import datetime, date, timedelta
+from dateutil.relativedelta import relativedelta
 from . import integrity
 from . import logger_config
 
+try:
+    import orjson
+except ImportError:  # Optional: falls back to the stdlib json encoder
+    orjson = None
+
 logger = logger_config.get_logger(__name__)
 
 # Correct path assuming src/validation_runner.py -> src -> parent -> monthly_data
 BASE_DATA_DIR = pathlib.Path(__file__).resolve().parent.parent / "monthly_data"
 REPORT_FILE = BASE_DATA_DIR / "validation_report.json"
 
+# Only the columns used by the integrity checks are parsed from MET files
+NEEDED_COLS = frozenset(("TimeStamp", "StationId") + integrity.SENSOR_COLS)
+
+# Report summary counter incremented for each issue type
+ISSUE_SUMMARY_KEYS = {
+    "stuck_value": "stuck_values_count",
+    "out_of_range": "out_of_range_count",
+    "completeness": "completeness_issues_count",
+    "system_completeness": "system_issues_count",
+    "empty_row": "empty_rows_count",
+    "sensor_gap": "sensor_gaps_count",
+}
+
+@functools.lru_cache(maxsize=64)
+def _expected_index(start_iso, end_iso, freq="10min"):
+    """Expected timestamps for a period, memoized across files of the same period."""
+    return pd.date_range(pd.Timestamp(start_iso), pd.Timestamp(end_iso), freq=freq)
+
+# Exact-type converters for the values most common in reports, checked before
+# the slower isinstance/pd.isna fallbacks
+_JSON_DISPATCH = {
+    pd.Timestamp: pd.Timestamp.isoformat,
+    datetime: datetime.isoformat,
+    date: date.isoformat,
+    pd.Timedelta: str,
+    np.float64: float,
+    np.float32: float,
+    np.int64: int,
+    np.int32: int,
+    np.bool_: bool,
+}
+
+def _json_default(obj):
+    """Convert types the JSON encoders do not handle natively."""
+    convert = _JSON_DISPATCH.get(type(obj))
+    if convert is not None:
+        return convert(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, pd.Timedelta):
+        return str(obj)
+    # Handle other numpy types
+    if hasattr(obj, 'item'):
+        return obj.item()
+    if pd.isna(obj): # Handle NaN
+        return None
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
 class CustomJSONEncoder(json.JSONEncoder):
     """Custom JSON Encoder for standardizing complex types."""
     def default(self, obj):
-        if isinstance(obj, (datetime, date, pd.Timestamp)):
-            return obj.isoformat()
-        if isinstance(obj, pd.Timedelta):
-            return str(obj)
-        # Handle numpy types
-        if hasattr(obj, 'item'):
-             return obj.item()
-        if pd.isna(obj): # Handle NaN
-             return None
-        return super().default(obj)
+        try:
+            return _json_default(obj)
+        except TypeError:
+            return super().default(obj)
         
+def _write_report(report):
+    """
+    Write the report to REPORT_FILE, using orjson when it is installed.
+    Both encoders write the same layout: UTF-8, 2-space indent and NaN as null.
+    """
+    if orjson is not None:
+        with open(REPORT_FILE, "wb") as f:
+            f.write(orjson.dumps(
+                report,
+                default=_json_default,
+                option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2
+            ))
+    else:
+        with open(REPORT_FILE, "w", encoding="utf-8") as f:
+            json.dump(_json_safe(report), f, indent=2, ensure_ascii=False)
+
+def _period_bounds(periods):
+    """
+    Start and end (last second) of each 'YYYY-MM' period.
+    Periods that cannot be parsed map to None.
+    """
+    bounds = {}
+    for period_str in periods:
+        try:
+            period_start = datetime.strptime(period_str, "%Y-%m")
+        except ValueError:
+            bounds[period_str] = None
+            continue
+        # End of month is start of next month - 1 second
+        bounds[period_str] = (period_start, period_start + relativedelta(months=1) - timedelta(seconds=1))
+    return bounds
+
+def _effective_range(file_path, parsed_start=None, parsed_end=None, period_bounds=None):
+    """
+    Effective (start, end) checked for a MET file: its month, capped at now and
+    narrowed by the override dates. (None, None) if the period cannot be parsed.
+    period_bounds is the precomputed _period_bounds table (computed for this
+    file's period if not given).
+    """
+    # Extract period from filename (YYYY-MM-met.csv)
+    period_str = file_path.name[:7] # YYYY-MM
+    if period_bounds is None:
+        period_bounds = _period_bounds([period_str])
+    bounds = period_bounds.get(period_str)
+    if bounds is None:
+        return None, None
+
+    period_start, month_end = bounds
+
+    # Determine effective range
+    actual_start = period_start
+    actual_end = min(month_end, datetime.now())
+
+    # Apply overrides
+    if parsed_start:
+        actual_start = max(actual_start, parsed_start)
+
+    if parsed_end:
+        actual_end = min(actual_end, parsed_end)
+
+    return actual_start, actual_end
+
+def _json_safe(obj):
+    """
+    Convert a result to JSON-native types (str, float, int, list, dict, None),
+    the same types a report read back from disk contains. NaN becomes None.
+    """
+    if isinstance(obj, dict):
+        return {k: _json_safe(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_json_safe(v) for v in obj]
+    if obj is None or isinstance(obj, (str, bool, int)):
+        return obj
+    if isinstance(obj, float):
+        return None if obj != obj else obj
+    return _json_safe(_json_default(obj))
+
+def _scan_one_file(file_path, parsed_start=None, parsed_end=None, stuck_intervals=None, exclude_zero=False,
+                   period_bounds=None):
+    """
+    Runs the integrity scan on a single MET file.
+    Executed in a worker process by run_validation_scan.
+    period_bounds is the precomputed _period_bounds table (computed for this
+    file's period if not given).
+
+    Returns:
+        dict: {"file", "issues"} on success (issues is None if the file was
+        outside the requested range), or {"file", "error"} on failure.
+    """
+    try:
+        logger.info(f"[VALIDATE] Scanning {file_path.name}...")
+
+        actual_start, actual_end = _effective_range(file_path, parsed_start, parsed_end, period_bounds)
+
+        if actual_start is not None:
+            # If range is invalid (start > end), skip file
+            if actual_start > actual_end:
+                logger.info(f"[VALIDATE] File {file_path.name} outside of requested range. Skipping.")
+                return {"file": file_path.name, "issues": None}
+
+        else:
+            logger.warning(f"[VALIDATE] Could not parse period from filename {file_path.name}. Skipping completeness check.")
+
+        df = pd.read_csv(file_path, usecols=lambda c: c in NEEDED_COLS)
+
+        # Simple timestamp conversion if needed for sorting/reporting dates
+        if 'TimeStamp' in df.columns:
+            df['TimeStamp'] = pd.to_datetime(df['TimeStamp'], errors='coerce')
+
+            # Filter dataframe rows by date if needed
+            if actual_start and actual_end:
+                 df = df[(df['TimeStamp'] >= actual_start) & (df['TimeStamp'] <= actual_end)]
+
+        expected_index = None
+        if actual_start and actual_end:
+            expected_index = _expected_index(actual_start.isoformat(), actual_end.isoformat())
+
+        # Run integrity checks
+        issues = integrity.scan_met_integrity(
+            df,
+            period_start=actual_start,
+            period_end=actual_end,
+            stuck_intervals=stuck_intervals,
+            exclude_zero=exclude_zero,
+            expected_index=expected_index
+        )
+
+        # Remove 'indices' and 'mask' to keep JSON small and avoiding duplicates.
+        # Issues are returned as JSON-native values, like results reused from a saved report.
+        return {
+            "file": file_path.name,
+            "issues": [_json_safe({k: v for k, v in issue.items() if k not in ['indices', 'mask']}) for issue in issues]
+        }
+
+    except Exception as e:
+        logger.error(f"[VALIDATE] Error processing file {file_path.name}: {e}")
+        logger.debug(f"[VALIDATE] Traceback: {traceback.format_exc()}")
+        return {
+            "file": file_path.name,
+            "error": str(e)
+        }
+
+def _file_fingerprint(file_path, actual_start, actual_end, stuck_intervals, exclude_zero):
+    """
+    Fingerprint of a MET file and the scan parameters applied to it: the file's
+    effective range (see _effective_range), the stuck settings, the range thresholds
+    and the version of the integrity checks.
+    A file whose fingerprint matches the previous report does not need rescanning.
+    """
+    st = file_path.stat()
+    range_str = f"{pd.Timestamp(actual_start)}/{pd.Timestamp(actual_end)}" if actual_start is not None else "-"
+    stuck_intervals = stuck_intervals or integrity.DEFAULT_STUCK_INTERVALS
+    thresholds = ";".join(f"{base}={list(bounds)}" for base, bounds in integrity.MET_CHECKS)
+    return (
+        f"v{integrity.SCAN_VERSION}:{st.st_mtime_ns}:{st.st_size}:{range_str}:"
+        f"{stuck_intervals}:{exclude_zero}:{thresholds}"
+    )
+
+def _load_previous_report():
+    """Load the last saved validation report, or an empty dict if unavailable."""
+    if not REPORT_FILE.exists():
+        return {}
+    try:
+        with open(REPORT_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning(f"[VALIDATE] Could not read previous validation report: {e}")
+        return {}
+
 def run_validation_scan(target_periods=None, override_start_date=None, override_end_date=None, stuck_intervals=None, exclude_zero=False):
     """
     Scans MET data files and generates a validation report.
@@ -59,15 +283,19 @@ def run_validation_scan(target_periods=None, override_start_date=None, override_
         logger.error(f"[VALIDATE] MET data directory not found: {met_dir}")
         return report
 
-    all_files = sorted(list(met_dir.glob("*-met.csv")))
+    # scandir avoids the glob machinery and the Path objects of non-matching entries
+    with os.scandir(met_dir) as entries:
+        all_files = sorted(
+            (pathlib.Path(e.path) for e in entries if e.is_file() and e.name.endswith("-met.csv")),
+            key=lambda p: p.name
+        )
     
     # Filter by target periods if provided
     files = []
     if target_periods:
-        for f in all_files:
-            # Check if filename starts with any of the target periods
-            if any(f.name.startswith(p) for p in target_periods):
-                files.append(f)
+        # File names start with their 'YYYY-MM' period: one set lookup per file
+        target_set = set(target_periods)
+        files = [f for f in all_files if f.name[:7] in target_set]
     else:
         # If no target periods but date range provided, filter files by range
         if override_start_date or override_end_date:
@@ -103,101 +331,96 @@ def run_validation_scan(target_periods=None, override_start_date=None, override_
         except:
              logger.warning(f"[VALIDATE] Invalid override end date: {override_end_date}")
 
+    # Reuse results of the previous report for files unchanged since it was written
+    previous_report = _load_previous_report()
+    previous_fingerprints = previous_report.get("fingerprints", {})
+    previous_details = {d["file"]: d for d in previous_report.get("details", [])}
+    current_period = datetime.now().strftime("%Y-%m")
+
+    # Period boundaries are computed once for every month being checked
+    period_bounds = _period_bounds({f.name[:7] for f in files})
+
+    fingerprints = {}
+    reused = {}
+    files_to_scan = []
     for file_path in files:
+        # Keyed on the effective range rather than the override dates, which move
+        # with every scheduled run even when a past month's window does not
+        actual_start, actual_end = _effective_range(file_path, parsed_start, parsed_end, period_bounds)
+        fingerprint = _file_fingerprint(file_path, actual_start, actual_end, stuck_intervals, exclude_zero)
+        fingerprints[file_path.name] = fingerprint
+        previous = previous_details.get(file_path.name)
+
+        # The current month's effective range moves with the clock, so it is always rescanned
+        if (
+            file_path.name[:7] < current_period
+            and previous_fingerprints.get(file_path.name) == fingerprint
+            and (previous is None or "error" not in previous)
+        ):
+            # Files absent from the previous details had no issues
+            reused[file_path.name] = previous or {"file": file_path.name, "issues": None}
+        else:
+            files_to_scan.append(file_path)
+
+    if reused:
+        logger.info(f"[VALIDATE] Reusing previous results for {len(reused)} unchanged file(s)")
+
+    scan_file = partial(
+        _scan_one_file,
+        parsed_start=parsed_start,
+        parsed_end=parsed_end,
+        stuck_intervals=stuck_intervals,
+        exclude_zero=exclude_zero,
+        period_bounds=period_bounds
+    )
+
+    scanned = None
+    # Pool workers outlive a parent that is terminate()d (API abort, scheduler stop),
+    # so the pool is only used when this scan runs in the main process
+    if len(files_to_scan) > 1 and multiprocessing.parent_process() is None:
+        # Files are independent pandas pipelines: scan them in parallel processes
+        max_workers = min(len(files_to_scan), os.cpu_count() or 1)
+        # Batch files per task only when there are many more files than workers
+        chunksize = max(1, len(files_to_scan) // (max_workers * 4))
         try:
-            logger.info(f"[VALIDATE] Scanning {file_path.name}...")
-            
-            # Extract period from filename (YYYY-MM-met.csv)
-            try:
-                period_str = file_path.name[:7] # YYYY-MM
-                period_start = datetime.strptime(period_str, "%Y-%m")
-                # End of month is start of next month - 1 second
-                next_month = period_start.replace(day=1) + pd.DateOffset(months=1)
-                month_end = next_month - pd.Timedelta(seconds=1)
-                
-                # Determine effective range
-                actual_start = period_start
-                actual_end = min(month_end, datetime.now())
-                
-                # Apply overrides
-                if parsed_start:
-                    actual_start = max(actual_start, parsed_start)
-                
-                if parsed_end:
-                     actual_end = min(actual_end, parsed_end)
-                
-                # If range is invalid (start > end), skip file
-                if actual_start > actual_end:
-                    logger.info(f"[VALIDATE] File {file_path.name} outside of requested range. Skipping.")
-                    continue
-
-            except ValueError:
-                logger.warning(f"[VALIDATE] Could not parse period from filename {file_path.name}. Skipping completeness check.")
-                actual_start = None
-                actual_end = None
-
-            df = pd.read_csv(file_path)
-            
-            # Simple timestamp conversion if needed for sorting/reporting dates
-            if 'TimeStamp' in df.columns:
-                df['TimeStamp'] = pd.to_datetime(df['TimeStamp'], errors='coerce')
-                
-                # Filter dataframe rows by date if needed
-                if actual_start and actual_end:
-                     df = df[(df['TimeStamp'] >= actual_start) & (df['TimeStamp'] <= actual_end)]
-
-            # Run integrity checks
-            issues = integrity.scan_met_integrity(
-                df, 
-                period_start=actual_start, 
-                period_end=actual_end,
-                stuck_intervals=stuck_intervals,
-                exclude_zero=exclude_zero
-            )
-            
-            if issues:
-                files_with_issues += 1
-                report["summary"]["total_issues"] += len(issues)
-                
-                file_report = {
-                    "file": file_path.name,
-                    "issues": []
-                }
-                
-                for issue in issues:
-                    # Remove 'indices' and 'mask' to keep JSON small and avoiding duplicates
-                    clean_issue = {k: v for k, v in issue.items() if k not in ['indices', 'mask']}
-                    file_report["issues"].append(clean_issue)
-                    
-                    if issue['type'] == 'stuck_value':
-                        report["summary"]["stuck_values_count"] += 1
-                    elif issue['type'] == 'out_of_range':
-                        report["summary"]["out_of_range_count"] += 1
-                    elif issue['type'] == 'completeness':
-                        report["summary"]["completeness_issues_count"] += 1
-                    elif issue['type'] == 'system_completeness':
-                        report["summary"]["system_issues_count"] += 1
-                    elif issue['type'] == 'empty_row':
-                        report["summary"]["empty_rows_count"] += 1
-                    elif issue['type'] == 'sensor_gap':
-                        report["summary"]["sensor_gaps_count"] += 1
-                        
-                report["details"].append(file_report)
-                
-        except Exception as e:
-            logger.error(f"[VALIDATE] Error processing file {file_path.name}: {e}")
-            logger.debug(f"[VALIDATE] Traceback: {traceback.format_exc()}")
-            report["details"].append({
-                "file": file_path.name,
-                "error": str(e)
-            })
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                scanned = list(executor.map(scan_file, files_to_scan, chunksize=chunksize))
+        except BrokenProcessPool as e:
+            logger.warning(f"[VALIDATE] Scan worker process died ({e}), scanning files in-process")
+
+    if scanned is None:
+        scanned = [scan_file(f) for f in files_to_scan]
+
+    scanned = {result["file"]: result for result in scanned}
+    results = [reused.get(f.name) or scanned[f.name] for f in files]
+
+    for result in results:
+        if "error" in result:
+            # Failed files are retried on the next run
+            fingerprints.pop(result["file"], None)
+            report["details"].append(result)
+            continue
+
+        issues = result.get("issues")
+        if not issues:
+            continue
+
+        files_with_issues += 1
+        report["summary"]["total_issues"] += len(issues)
+
+        for issue_type, type_issues in integrity.group_issues_by_type(issues).items():
+            summary_key = ISSUE_SUMMARY_KEYS.get(issue_type)
+            if summary_key:
+                report["summary"][summary_key] += len(type_issues)
+
+        report["details"].append(result)
 
     report["summary"]["files_with_issues"] = files_with_issues
+    report["fingerprints"] = fingerprints
     
     # Save report
     try:
-        with open(REPORT_FILE, "w") as f:
-            json.dump(report, f, cls=CustomJSONEncoder, indent=4)
+        _write_report(report)
         logger.info(f"[VALIDATE] Validation report saved to {REPORT_FILE}")
     except Exception as e:
          logger.error(f"[VALIDATE] Failed to save validation report: {e}")
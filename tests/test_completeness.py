@@ -30,11 +30,8 @@ class TestCompleteness(unittest.TestCase):
         end = datetime(2023, 1, 1, 0, 30)
         # Expected: 00:00, 00:10, 00:20, 00:30 (4 points)
         # Actual: 00:00, 00:20 (Missing 00:10, 00:30)
-        timestamps = [
-            datetime(2023, 1, 1, 0, 0),
-            datetime(2023, 1, 1, 0, 20)
-        ]
-        df = pd.DataFrame({"TimeStamp": pd.to_datetime(timestamps)})
+        timestamps = pd.date_range(start=start, periods=2, freq="20min")
+        df = pd.DataFrame({"TimeStamp": timestamps})
         
         result = check_completeness(df, start, end, frequency="10min")
         
@@ -59,11 +56,8 @@ class TestCompleteness(unittest.TestCase):
         end = datetime(2023, 1, 1, 0, 20)
         # Expected: 00:00, 00:10, 00:20 (3 points)
         # Data: 00:00, 00:30 (one valid, one out)
-        timestamps = [
-            datetime(2023, 1, 1, 0, 0),
-            datetime(2023, 1, 1, 0, 30)
-        ]
-        df = pd.DataFrame({"TimeStamp": pd.to_datetime(timestamps)})
+        timestamps = pd.date_range(start=start, periods=2, freq="30min")
+        df = pd.DataFrame({"TimeStamp": timestamps})
         
         result = check_completeness(df, start, end, frequency="10min")
         
@@ -71,5 +65,16 @@ class TestCompleteness(unittest.TestCase):
         self.assertEqual(result["total_expected"], 3)
         self.assertEqual(result["completeness_percentage"], 33.33)  # 1/3 present
 
+    def test_completeness_precomputed_index(self):
+        start = datetime(2023, 1, 1, 0, 0)
+        end = datetime(2023, 1, 1, 0, 30)
+        expected_index = pd.date_range(start=start, end=end, freq="10min")
+        df = pd.DataFrame({"TimeStamp": expected_index[:1]})
+
+        result = check_completeness(df, start, end, expected_index=expected_index)
+
+        self.assertEqual(result["missing_count"], 3)
+        self.assertEqual(result["total_expected"], 4)
+
 if __name__ == "__main__":
     unittest.main()
@@ -7,16 +7,22 @@ import os
 # Add src to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from src.integrity import check_met_integrity
+from src.integrity import check_met_integrity, check_stuck_values
 
 
 class TestMetIntegrity(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Shared 10min timestamps and station ids for the fixtures
+        cls.TS = pd.date_range("2023-01-01", periods=4, freq="10min")
+        cls.SID = np.ones(4, dtype=np.int32)
+
     def test_range_checks(self):
         # Create dummy data
         df = pd.DataFrame(
             {
-                "TimeStamp": pd.to_datetime(["2023-01-01 00:00", "2023-01-01 00:10"]),
-                "StationId": [1, 1],
+                "TimeStamp": self.TS[:2],
+                "StationId": self.SID[:2],
                 "met_WindSpeedRot_mean": [10.5, 100.0],  # 100 is out of range [0, 50]
                 "met_TemperatureTen_mean": [
                     -60.0,
@@ -43,19 +49,12 @@ class TestMetIntegrity(unittest.TestCase):
         # Create dummy data with stuck values (n=3)
         df = pd.DataFrame(
             {
-                "TimeStamp": pd.to_datetime(
-                    [
-                        "2023-01-01 00:00",
-                        "2023-01-01 00:10",
-                        "2023-01-01 00:20",
-                        "2023-01-01 00:30",
-                    ]
-                ),
-                "StationId": [1, 1, 1, 1],
-                "met_WindSpeedRot_mean": [12.0, 12.0, 12.0, 12.0],
-                "met_WindSpeedRot_min": [11.0, 11.0, 11.0, 11.0],
-                "met_WindSpeedRot_max": [13.0, 13.0, 13.0, 13.0],
-                "met_WindSpeedRot_stddev": [0.5, 0.5, 0.5, 0.5],
+                "TimeStamp": self.TS,
+                "StationId": self.SID,
+                "met_WindSpeedRot_mean": np.full(4, 12.0),
+                "met_WindSpeedRot_min": np.full(4, 11.0),
+                "met_WindSpeedRot_max": np.full(4, 13.0),
+                "met_WindSpeedRot_stddev": np.full(4, 0.5),
                 "met_TemperatureTen_mean": [
                     20.0,
                     20.1,
@@ -80,25 +79,103 @@ class TestMetIntegrity(unittest.TestCase):
         # Zero wind speed SHOULD be marked as stuck (user requirement change)
         df = pd.DataFrame(
             {
-                "TimeStamp": pd.to_datetime(
-                    [
-                        "2023-01-01 00:00",
-                        "2023-01-01 00:10",
-                        "2023-01-01 00:20",
-                        "2023-01-01 00:30",
-                    ]
-                ),
-                "StationId": [1, 1, 1, 1],
-                "met_WindSpeedRot_mean": [0.0, 0.0, 0.0, 0.0],
-                "met_WindSpeedRot_min": [0.0, 0.0, 0.0, 0.0],
-                "met_WindSpeedRot_max": [0.0, 0.0, 0.0, 0.0],
-                "met_WindSpeedRot_stddev": [0.0, 0.0, 0.0, 0.0],
+                "TimeStamp": self.TS,
+                "StationId": self.SID,
+                "met_WindSpeedRot_mean": np.zeros(4),
+                "met_WindSpeedRot_min": np.zeros(4),
+                "met_WindSpeedRot_max": np.zeros(4),
+                "met_WindSpeedRot_stddev": np.zeros(4),
             }
         )
 
         df_clean = check_met_integrity(df)
         self.assertTrue(df_clean["met_WindSpeedRot_mean"].isna().all())
 
+    def test_original_not_modified(self):
+        df = pd.DataFrame(
+            {
+                "TimeStamp": self.TS[:2],
+                "StationId": self.SID[:2],
+                "met_WindSpeedRot_mean": [10.5, 100.0],
+                "met_Pressure_mean": [1013, 1000],
+            }
+        )
+
+        df_clean = check_met_integrity(df)
+        self.assertTrue(np.isnan(df_clean.loc[1, "met_WindSpeedRot_mean"]))
+        self.assertEqual(df.loc[1, "met_WindSpeedRot_mean"], 100.0)
+
+        df_inplace = check_met_integrity(df, inplace=True)
+        self.assertIs(df_inplace, df)
+        self.assertTrue(np.isnan(df.loc[1, "met_WindSpeedRot_mean"]))
+
+
+class TestStuckDetection(unittest.TestCase):
+    def _frame(self, station_values, shuffle=False):
+        # One wind speed series per station (mean/min/max/stddev all equal),
+        # stations interleaved row by row on shared 10min timestamps
+        frames = []
+        for station_id, values in station_values.items():
+            values = np.asarray(values, dtype=np.float64)
+            frames.append(pd.DataFrame({
+                "TimeStamp": pd.date_range("2023-01-01", periods=len(values), freq="10min"),
+                "StationId": station_id,
+                "met_WindSpeedRot_mean": values,
+                "met_WindSpeedRot_min": values,
+                "met_WindSpeedRot_max": values,
+                "met_WindSpeedRot_stddev": values,
+            }))
+        df = pd.concat(frames).sort_values(["TimeStamp", "StationId"], kind="stable")
+        if shuffle:
+            df = df.sample(frac=1, random_state=0)
+        return df.reset_index(drop=True)
+
+    def _stuck_positions(self, df, **kwargs):
+        # (StationId, position in the station's series) of every stuck row
+        mask = check_stuck_values(df, "met_WindSpeedRot", **kwargs)
+        position = (df["TimeStamp"] - df["TimeStamp"].min()) // pd.Timedelta("10min")
+        return sorted(zip(df.loc[mask, "StationId"], position[mask]))
+
+    def test_shuffled_multi_station(self):
+        df = self._frame({1: [5, 5, 5, 6], 2: [7, 8, 8, 8]}, shuffle=True)
+        self.assertEqual(
+            self._stuck_positions(df, n_intervals=3),
+            [(1, 0), (1, 1), (1, 2), (2, 1), (2, 2), (2, 3)],
+        )
+
+    def test_runs_do_not_cross_station_boundary(self):
+        # Station 1 ends with the value station 2 starts with
+        df = self._frame({1: [1, 2, 3, 3], 2: [3, 3, 4, 5]}).sort_values(["StationId", "TimeStamp"])
+        self.assertEqual(self._stuck_positions(df, n_intervals=3), [])
+        self.assertEqual(
+            self._stuck_positions(df, n_intervals=2),
+            [(1, 2), (1, 3), (2, 0), (2, 1)],
+        )
+
+    def test_exclude_zero_inside_run(self):
+        df = self._frame({1: [5, 5, 0, 0, 0, 5, 5, 5]})
+        self.assertEqual(
+            self._stuck_positions(df, n_intervals=3),
+            [(1, 2), (1, 3), (1, 4), (1, 5), (1, 6), (1, 7)],
+        )
+        # Zero repeats no longer extend or form runs
+        self.assertEqual(
+            self._stuck_positions(df, n_intervals=3, exclude_zero=True),
+            [(1, 5), (1, 6), (1, 7)],
+        )
+
+    def test_small_n_intervals(self):
+        df = self._frame({1: [1, 1, 2, 3, 3, 3], 2: [4, 5, 5, 6, 7, 7]}, shuffle=True)
+        # n=1 flags only the rows repeating their predecessor
+        self.assertEqual(
+            self._stuck_positions(df, n_intervals=1),
+            [(1, 1), (1, 4), (1, 5), (2, 2), (2, 5)],
+        )
+        self.assertEqual(
+            self._stuck_positions(df, n_intervals=2),
+            [(1, 0), (1, 1), (1, 3), (1, 4), (1, 5), (2, 1), (2, 2), (2, 4), (2, 5)],
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
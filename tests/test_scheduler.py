@@ -0,0 +1,169 @@
+import unittest
+from unittest import mock
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+import tempfile
+import shutil
+import pathlib
+import json
+import sys
+import os
+
+# Add project root to path to allow importing src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import scheduler, email_send
+
+
+class SchedulerConfigTestCase(unittest.TestCase):
+    def setUp(self):
+        # Point the scheduler at a throwaway config file
+        tmp_dir = pathlib.Path(tempfile.mkdtemp())
+        self.config_file = tmp_dir / "scheduler_config.json"
+        patcher = mock.patch.object(scheduler, "SCHEDULER_CONFIG_FILE", self.config_file)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(shutil.rmtree, tmp_dir)
+
+    def _write(self, cfg):
+        self.config_file.write_text(json.dumps(cfg))
+
+    def _read(self):
+        return json.loads(self.config_file.read_text())
+
+
+class TestFailureAlert(SchedulerConfigTestCase):
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(email_send, "send_email")
+        self.send_email = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_alert_suppressed_within_cooldown(self):
+        last_alert = (datetime.now() - timedelta(hours=1)).isoformat()
+        self._write({"alert_cooldown_hours": 6, "last_alert_time": last_alert})
+
+        scheduler._send_failure_alert("boom", datetime.now())
+
+        self.send_email.assert_not_called()
+        self.assertEqual(self._read()["last_alert_time"], last_alert)
+
+    def test_alert_sent_after_cooldown(self):
+        last_alert = (datetime.now() - timedelta(hours=7)).isoformat()
+        self._write({"alert_cooldown_hours": 6, "last_alert_time": last_alert})
+
+        scheduler._send_failure_alert("boom", datetime.now())
+
+        self.send_email.assert_called_once()
+        self.assertGreater(self._read()["last_alert_time"], last_alert)
+
+    def test_failed_send_does_not_start_cooldown(self):
+        self._write({})
+        self.send_email.side_effect = OSError("smtp down")
+
+        scheduler._send_failure_alert("boom", datetime.now())
+
+        self.assertNotIn("last_alert_time", self._read())
+
+    def test_settings_saved_while_sending_are_kept(self):
+        self._write({"enabled": False})
+        # Simulate the user saving new settings while the email goes out
+        self.send_email.side_effect = lambda **kwargs: self._write({"enabled": True, "hour": 8})
+
+        scheduler._send_failure_alert("boom", datetime.now())
+
+        saved = self._read()
+        self.assertTrue(saved["enabled"])
+        self.assertEqual(saved["hour"], 8)
+        self.assertIn("last_alert_time", saved)
+
+
+class TestLoadConfig(SchedulerConfigTestCase):
+    def setUp(self):
+        super().setUp()
+        patcher_cfg = mock.patch.dict(scheduler._scheduler_config)
+        patcher_mtime = mock.patch.object(scheduler, "_config_mtime_ns", -1)
+        patcher_cfg.start()
+        patcher_mtime.start()
+        self.addCleanup(patcher_cfg.stop)
+        self.addCleanup(patcher_mtime.stop)
+
+    def _set_mtime(self, mtime_ns):
+        os.utime(self.config_file, ns=(mtime_ns, mtime_ns))
+
+    def test_unchanged_file_is_not_reread(self):
+        self._write({"hour": 7})
+        self._set_mtime(1_000_000_000)
+        self.assertEqual(scheduler._load_config()["hour"], 7)
+
+        with mock.patch("builtins.open", side_effect=AssertionError) as opened:
+            self.assertEqual(scheduler._load_config()["hour"], 7)
+        opened.assert_not_called()
+
+    def test_changed_mtime_reloads(self):
+        self._write({"hour": 7})
+        self._set_mtime(1_000_000_000)
+        scheduler._load_config()
+
+        self._write({"hour": 9})
+        self._set_mtime(2_000_000_000)
+
+        self.assertEqual(scheduler._load_config()["hour"], 9)
+
+    def test_failed_read_is_retried(self):
+        self.config_file.write_text("{not json")
+        self._set_mtime(1_000_000_000)
+        scheduler._load_config()
+
+        # Fix the file without changing its mtime: the next call must still read it
+        self._write({"hour": 9})
+        self._set_mtime(1_000_000_000)
+
+        self.assertEqual(scheduler._load_config()["hour"], 9)
+
+
+class TestWorkerRecovery(unittest.TestCase):
+    def setUp(self):
+        self.addCleanup(scheduler._shutdown_executor)
+        # The real job needs the database; the no-op task stands in for it
+        patcher = mock.patch.object(scheduler, "_processing_worker", scheduler._warm_up)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_trigger_after_worker_killed(self):
+        executor = scheduler._get_executor()
+        executor.submit(scheduler._warm_up).result(timeout=60)
+        for process in scheduler._worker_processes(executor):
+            process.kill()
+            process.join(timeout=10)
+
+        # A trigger racing the pool's own failure detection fails once; the next one must run
+        with mock.patch.object(scheduler, "_record_run_status") as record, \
+                mock.patch.object(scheduler, "_send_failure_alert"):
+            for _ in range(2):
+                scheduler._run_scheduled_processing()
+                try:
+                    scheduler._current_future.result(timeout=60)
+                    break
+                except scheduler.BrokenProcessPool:
+                    record.assert_called_once()
+            else:
+                self.fail("Trigger did not run after the worker process was killed")
+
+        self.assertIsNot(scheduler._executor, executor)
+
+    def test_dead_worker_is_recorded_and_alerted(self):
+        future = Future()
+        future.set_exception(scheduler.BrokenProcessPool("worker killed"))
+        job_time = datetime(2024, 1, 1, 6, 0)
+
+        with mock.patch.object(scheduler, "_record_run_status") as record, \
+                mock.patch.object(scheduler, "_send_failure_alert") as alert:
+            scheduler._on_job_done(future, job_time=job_time)
+
+        self.assertEqual(record.call_args.args[:2], (job_time, "error"))
+        self.assertIn("worker killed", alert.call_args.args[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,227 @@
+import unittest
+from unittest import mock
+import pandas as pd
+import numpy as np
+import tempfile
+import shutil
+import pathlib
+import sys
+import os
+from datetime import datetime
+
+# Add project root to path to allow importing src
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src import integrity, validation_runner
+
+
+class TestValidationReuse(unittest.TestCase):
+    def setUp(self):
+        # Point the runner at a throwaway data directory
+        self.base_dir = pathlib.Path(tempfile.mkdtemp())
+        self.met_dir = self.base_dir / "data" / "MET"
+        self.met_dir.mkdir(parents=True)
+        patcher_dir = mock.patch.object(validation_runner, "BASE_DATA_DIR", self.base_dir)
+        patcher_file = mock.patch.object(validation_runner, "REPORT_FILE", self.base_dir / "validation_report.json")
+        patcher_dir.start()
+        patcher_file.start()
+        self.addCleanup(patcher_dir.stop)
+        self.addCleanup(patcher_file.stop)
+        self.addCleanup(shutil.rmtree, self.base_dir)
+
+    def _write_met(self, period, stuck):
+        # One station over the whole month; stuck files repeat the same wind speed
+        start = pd.Timestamp(f"{period}-01")
+        timestamps = pd.date_range(start, start + pd.offsets.MonthEnd(0) + pd.Timedelta(hours=23, minutes=50), freq="10min")
+        values = np.full(len(timestamps), 10.0) if stuck else np.linspace(1.0, 40.0, len(timestamps))
+        pd.DataFrame({
+            "TimeStamp": timestamps,
+            "StationId": 1,
+            "met_WindSpeedRot_mean": values,
+            "met_WindSpeedRot_min": values,
+            "met_WindSpeedRot_max": values,
+            "met_WindSpeedRot_stddev": np.zeros(len(timestamps)),
+        }).to_csv(self.met_dir / f"{period}-met.csv", index=False)
+
+    def _scan(self, **kwargs):
+        # Run the scan while recording which files actually get scanned
+        real_scan = validation_runner._scan_one_file
+        with mock.patch.object(validation_runner, "_scan_one_file", side_effect=real_scan) as scan, \
+                mock.patch.object(validation_runner, "ProcessPoolExecutor", side_effect=AssertionError):
+            report = validation_runner.run_validation_scan(**kwargs)
+        return report, [call.args[0].name for call in scan.call_args_list]
+
+    def test_unchanged_file_is_reused(self):
+        self._write_met("2023-01", stuck=True)
+
+        first, scanned_first = self._scan(target_periods=["2023-01"])
+        second, scanned_second = self._scan(target_periods=["2023-01"])
+
+        self.assertEqual(scanned_first, ["2023-01-met.csv"])
+        self.assertEqual(scanned_second, [])
+        self.assertEqual(second["summary"], first["summary"])
+        self.assertEqual(second["details"], first["details"])
+
+    def test_moving_end_date_reuses_past_month(self):
+        # Scheduled runs cap the scan at yesterday, which changes every run
+        self._write_met("2023-01", stuck=True)
+
+        self._scan(target_periods=["2023-01"], override_end_date="2024-05-01")
+        _, scanned = self._scan(target_periods=["2023-01"], override_end_date="2024-05-08")
+
+        self.assertEqual(scanned, [])
+
+    def test_effective_range_change_rescans(self):
+        self._write_met("2023-01", stuck=True)
+
+        self._scan(target_periods=["2023-01"])
+        _, scanned = self._scan(target_periods=["2023-01"], override_end_date="2023-01-15")
+
+        self.assertEqual(scanned, ["2023-01-met.csv"])
+
+    def test_threshold_change_rescans(self):
+        self._write_met("2023-01", stuck=True)
+
+        self._scan(target_periods=["2023-01"])
+        checks = (("met_WindSpeedRot", [0, 5]),) + integrity.MET_CHECKS[1:]
+        with mock.patch.object(integrity, "MET_CHECKS", checks):
+            _, scanned = self._scan(target_periods=["2023-01"])
+
+        self.assertEqual(scanned, ["2023-01-met.csv"])
+
+    def test_scan_version_change_rescans(self):
+        self._write_met("2023-01", stuck=True)
+
+        self._scan(target_periods=["2023-01"])
+        with mock.patch.object(integrity, "SCAN_VERSION", integrity.SCAN_VERSION + 1):
+            _, scanned = self._scan(target_periods=["2023-01"])
+
+        self.assertEqual(scanned, ["2023-01-met.csv"])
+
+    def test_current_month_is_rescanned(self):
+        period = datetime.now().strftime("%Y-%m")
+        self._write_met(period, stuck=True)
+
+        self._scan(target_periods=[period])
+        _, scanned = self._scan(target_periods=[period])
+
+        self.assertEqual(scanned, [f"{period}-met.csv"])
+
+    def test_failed_file_is_retried(self):
+        self._write_met("2023-01", stuck=True)
+
+        failure = {"file": "2023-01-met.csv", "error": "boom"}
+        with mock.patch.object(validation_runner, "_scan_one_file", return_value=failure):
+            report = validation_runner.run_validation_scan(target_periods=["2023-01"])
+        self.assertEqual(report["details"], [failure])
+        self.assertNotIn("2023-01-met.csv", report["fingerprints"])
+
+        report, scanned = self._scan(target_periods=["2023-01"])
+        self.assertEqual(scanned, ["2023-01-met.csv"])
+        self.assertGreater(report["summary"]["stuck_values_count"], 0)
+
+    def test_file_without_issues_is_reused(self):
+        # Clean files are absent from the report details but still fingerprinted
+        self._write_met("2023-02", stuck=False)
+
+        first, _ = self._scan(target_periods=["2023-02"])
+        second, scanned = self._scan(target_periods=["2023-02"])
+
+        self.assertEqual(first["details"], [])
+        self.assertEqual(scanned, [])
+        self.assertEqual(second["details"], [])
+        self.assertEqual(second["summary"]["files_with_issues"], 0)
+
+    def test_broken_pool_falls_back_to_in_process_scan(self):
+        self._write_met("2023-01", stuck=True)
+        self._write_met("2023-02", stuck=False)
+
+        pool = mock.MagicMock()
+        pool.return_value.__enter__.return_value.map.side_effect = validation_runner.BrokenProcessPool("killed")
+        with mock.patch.object(validation_runner, "ProcessPoolExecutor", pool), \
+                mock.patch.object(validation_runner.multiprocessing, "parent_process", return_value=None):
+            report = validation_runner.run_validation_scan(target_periods=["2023-01", "2023-02"])
+
+        pool.assert_called_once()
+        self.assertTrue(validation_runner.REPORT_FILE.exists())
+        self.assertEqual(report["summary"]["files_with_issues"], 1)
+        self.assertGreater(report["summary"]["stuck_values_count"], 0)
+
+    def test_no_pool_inside_child_process(self):
+        self._write_met("2023-01", stuck=True)
+        self._write_met("2023-02", stuck=False)
+
+        with mock.patch.object(validation_runner.multiprocessing, "parent_process", return_value=object()):
+            _, scanned = self._scan(target_periods=["2023-01", "2023-02"])
+
+        self.assertEqual(scanned, ["2023-01-met.csv", "2023-02-met.csv"])
+
+    def test_details_use_json_types(self):
+        self._write_met("2023-01", stuck=True)
+
+        report, _ = self._scan(target_periods=["2023-01"])
+        stuck = [i for i in report["details"][0]["issues"] if i["type"] == "stuck_value"][0]
+
+        self.assertIsInstance(stuck["range_start"], str)
+        self.assertIsInstance(stuck["sample_value"], float)
+
+
+class TestWriteReport(unittest.TestCase):
+    REPORT = {
+        "last_run": pd.Timestamp("2023-01-01 00:10"),
+        "details": [{"file": "2023-01-met.csv", "issues": [{
+            "sensor": "Température",
+            "sample_value": np.float64(np.nan),
+            "count": np.int64(3),
+            "bounds": (0, 50),
+        }]}],
+    }
+    EXPECTED = (
+        '{\n'
+        '  "last_run": "2023-01-01T00:10:00",\n'
+        '  "details": [\n'
+        '    {\n'
+        '      "file": "2023-01-met.csv",\n'
+        '      "issues": [\n'
+        '        {\n'
+        '          "sensor": "Température",\n'
+        '          "sample_value": null,\n'
+        '          "count": 3,\n'
+        '          "bounds": [\n'
+        '            0,\n'
+        '            50\n'
+        '          ]\n'
+        '        }\n'
+        '      ]\n'
+        '    }\n'
+        '  ]\n'
+        '}'
+    )
+
+    def _write(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            report_file = pathlib.Path(tmp) / "validation_report.json"
+            with mock.patch.object(validation_runner, "REPORT_FILE", report_file):
+                validation_runner._write_report(self.REPORT)
+            return report_file.read_text(encoding="utf-8")
+
+    def test_stdlib_layout(self):
+        with mock.patch.object(validation_runner, "orjson", None):
+            self.assertEqual(self._write(), self.EXPECTED)
+
+    def test_previous_report_round_trip(self):
+        # The report is UTF-8 whatever the platform's default encoding is
+        with tempfile.TemporaryDirectory() as tmp:
+            report_file = pathlib.Path(tmp) / "validation_report.json"
+            with mock.patch.object(validation_runner, "REPORT_FILE", report_file):
+                validation_runner._write_report(self.REPORT)
+                loaded = validation_runner._load_previous_report()
+        self.assertEqual(loaded["details"][0]["issues"][0]["sensor"], "Température")
+
+    @unittest.skipIf(validation_runner.orjson is None, "orjson is not installed")
+    def test_orjson_layout(self):
+        self.assertEqual(self._write(), self.EXPECTED)
+
+
+if __name__ == '__main__':
+    unittest.main()